@@ -1,5 +1,4 @@
-from typing import List
-
+import numpy as np
 import matplotlib.pyplot as plt
 
 from qosst_sim.modulation.gaussian_qam import GaussianQAM
@@ -11,7 +10,7 @@ from qosst_sim.simulator.gaussian_channel_asymptotic_calculator import (
 )
 
 
-def linear_range(start: float, stop: float, num_points: int) -> List[float]:
+def linear_range(start: float, stop: float, num_points: int) -> np.ndarray:
     """
     Return a linear range from start to stop with num_points.
 
@@ -21,10 +20,9 @@ def linear_range(start: float, stop: float, num_points: int) -> List[float]:
         num_points (int): number of points in the range
 
     Returns:
-        List[float]: range.
+        np.ndarray: range.
     """
-    step = (stop - start) / num_points
-    return [start + x * step for x in range(num_points + 1)]
+    return np.linspace(start, stop, num_points + 1)
 
 
 def transmission(distance: float) -> float:
@@ -52,10 +50,6 @@ xi_bob = 0.02
 electronic_noise = 0.01
 eta = 0.65
 
-simulated_skr = []
-asymptotic_skr = []
-
-
 modulation = GaussianQAM(dim, modulation_size, variance, nu)
 label = (
     " PCS " + str(modulation_size**2) + "-QAM, dim =" + str(dim) + ", nu = " + str(nu)
@@ -63,10 +57,21 @@ label = (
 detector = NoisyHeterodyneDetector(eta, electronic_noise)
 label += " (noisy detector eta =" + str(eta) + " Vel = " + str(electronic_noise) + ")"
 
-for distance in varying_range:
+simulated_skr = []
+asymptotic_skr = []
+
+# the distances are evaluated one after the other (this script is also run by the
+# plot directive of the documentation, where a process pool cannot pickle the work),
+# each with its own random stream so that the sweep is reproducible
+seeds = np.random.SeedSequence(12345).spawn(len(varying_range))
+for distance, seed in zip(varying_range, seeds):
     # initialize the channel of the desired type
     transmittance = transmission(distance)
-    channel = GaussianChannel(transmittance, xi_bob / (transmittance * detector.eta))
+    channel = GaussianChannel(
+        transmittance,
+        xi_bob / (transmittance * detector.eta),
+        rng=np.random.Generator(np.random.SFC64(seed)),
+    )
 
     # initialize the simulator of the desired type
     simulator = FiniteSizeSimulator(modulation, channel, detector, num_symbols, beta)
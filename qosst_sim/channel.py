@@ -18,6 +18,7 @@
 """
 Module containg the class of channels.
 """
+from typing import Optional
 
 import numpy as np
 from qosst_sim.detector import Detector
@@ -33,17 +34,28 @@ class GaussianChannel:
 
     t: float  #: Transmittance of the channel.
     xi: float  #: Excess noise of the channel.
+    rng: np.random.Generator  #: Random generator used to sample the output.
 
-    def __init__(self, t: float, xi: float):
+    def __init__(self, t: float, xi: float, rng: Optional[np.random.Generator] = None):
         """
         Args:
             T (float): transmission of the channel.
             xi (float): additive noise of the channel.
+            rng (Optional[np.random.Generator], optional): random generator used to sample the output of the channel. If None, a new SFC64 based generator is created. Defaults to None.
         """
         self.t = t
         self.xi = xi
-
-    def sample_output(self, symbols: np.ndarray, detector: Detector) -> np.ndarray:
+        self.rng = rng if rng is not None else np.random.Generator(np.random.SFC64())
+
+    # pylint: disable=too-many-arguments
+    def sample_output(
+        self,
+        symbols: np.ndarray,
+        detector: Detector,
+        rng: Optional[np.random.Generator] = None,
+        out: Optional[np.ndarray] = None,
+        dtype: type = np.complex128,
+    ) -> np.ndarray:
         """
         Pseudo-random sampler of the output of a Gaussian Channel. If the symbols at the entrance
         are x_k, the output is :
@@ -58,6 +70,9 @@ class GaussianChannel:
         Args:
             symbols (np.ndarray): array of the N symboles sampled by Alice according to her modulation.
             detector (Detector): container of the values of eta and Vel.
+            rng (Optional[np.random.Generator], optional): random generator used to sample the noise. If None, the generator of the channel is used. Defaults to None.
+            out (Optional[np.ndarray], optional): contiguous complex array of the same length as symbols in which the output is written, so it can be reused across calls. If None, a new array is allocated. Defaults to None.
+            dtype (type, optional): complex dtype of the output (np.complex128 or np.complex64) when out is None. Defaults to np.complex128.
 
         Returns:
             np.ndarray: corresponding symboles that Bob receives at the exit of the channel.
@@ -66,11 +81,18 @@ class GaussianChannel:
         num_symbols = len(symbols)
         eta = detector.eta
         vel = detector.vel
-        noise_r = np.random.normal(
-            0, 0.5 * np.sqrt(1 + vel + eta * self.t * self.xi / 2), num_symbols
-        )
-        noise_i = np.random.normal(
-            0, 0.5 * np.sqrt(1 + vel + eta * self.t * self.xi / 2), num_symbols
-        )
-
-        return np.sqrt(self.t * eta / 2) * symbols + noise_r + 1j * noise_i
+        if rng is None:
+            rng = self.rng
+
+        sigma = 0.5 * np.sqrt(1 + vel + eta * self.t * self.xi / 2)
+
+        # the noise is drawn directly in the output buffer, the real and imaginary
+        # parts being its interleaved pairs of floats, and then scaled in place
+        if out is None:
+            out = np.empty(num_symbols, dtype=dtype)
+        real_dtype = out.real.dtype
+        rng.standard_normal(dtype=real_dtype, out=out.view(real_dtype))
+        out *= sigma
+        out += np.sqrt(self.t * eta / 2) * symbols
+
+        return out
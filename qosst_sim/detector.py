@@ -20,12 +20,91 @@ Module containing the class of detectors.
 """
 import abc
 from typing import Tuple
-from math import sqrt
 
-from qosst_sim.utils import delta, gamma, g
+import numpy as np
+
+from qosst_sim.utils import delta, gamma, g, g_vec
 
 
 # pylint: disable=invalid-name
+def _sympl_ideal(V: float, W: float, Z: float) -> Tuple[float, float, float]:
+    """Symplectic eigenvalues for the ideal heterodyne detector.
+
+    See :meth:`IdealHeterodyneDetector.sympl`. V, W and Z can also be arrays, in which
+    case the eigenvalues are computed elementwise.
+
+    Args:
+        V (float): coefficient of the first diagonal block of the covariance matrix
+        W (float): coefficient of the second diagonal block of the covariance matrix
+        Z (float): coefficient of the antidiagonal blocks of the covariance matrix
+
+    Returns:
+        Tuple[float, float, float]: v1, v2, v3.
+    """
+    delt = delta(V, W, Z)
+    gam = gamma(V, W, Z)
+    root = np.sqrt(delt * delt - 4 * gam)
+
+    v1 = np.sqrt((delt + root) / 2)
+    v2 = np.sqrt((delt - root) / 2)
+    v3 = V - Z * Z / (W + 1)
+
+    return v1, v2, v3
+
+
+# pylint: disable=too-many-locals
+def _sympl_noisy(
+    V: float, W: float, Z: float, eta: float
+) -> Tuple[float, float, float, float]:
+    """Symplectic eigenvalues for the noisy heterodyne detector.
+
+    See :meth:`NoisyHeterodyneDetector.sympl`. V, W and Z can also be arrays, in which
+    case the eigenvalues are computed elementwise.
+
+    Args:
+        V (float): coefficient of the first diagonal block of the covariance matrix AB
+        W (float): coefficient of the second diagonal block of the covariance matrix AB
+        Z (float): coefficient of the antidiagonal blocks of the covariance matrix AB
+        eta (float): efficiency of the detector.
+
+    Returns:
+        Tuple[float, float, float, float]: v1, v2, v3, v4.
+    """
+    delt = delta(V, W, Z)
+    gam = gamma(V, W, Z)
+    root = np.sqrt(delt * delt - 4 * gam)
+
+    v1 = np.sqrt((delt + root) / 2)
+    v2 = np.sqrt((delt - root) / 2)
+
+    # The variance of the EPR state modelling the electronic noise should be
+    # nu = 1 + 2 * vel / (1 - eta), but the computation has always been
+    # done with nu = 1 (vacuum). This is kept as is until the intent is confirmed.
+    nu = 1
+
+    Z2 = Z * Z
+    nu2 = nu * nu
+    denom = 1 + W * eta + nu - eta * nu
+    denom2 = denom * denom
+
+    r1 = (
+        (V * denom - eta * Z2) ** 2
+        + (eta * nu + W * (1 - eta + nu)) ** 2
+        + (1 + nu + eta * (W * nu - 1)) ** 2
+        - 2 * (1 - eta) * (nu + 1) ** 2 * Z2
+        - 2 * eta * (1 - eta) * (nu2 - 1) * Z2
+        - 2 * eta * (nu2 - 1) * (1 + W) ** 2
+    ) / denom2
+
+    r1 -= 1
+    r2 = (Z2 - V * (W + eta) + (V * W - Z2) * (-1 + eta) * nu) ** 2 / denom2
+    root = np.sqrt(r1 * r1 - 4 * r2)
+
+    v3 = np.sqrt(0.5 * (r1 + root))
+    v4 = np.sqrt(0.5 * (r1 - root))
+    return v1, v2, v3, v4
+
+
 class Detector(abc.ABC):
     """
     Abstract class for detectors.
@@ -60,6 +139,24 @@ class Detector(abc.ABC):
             float: Holevo's bound.
         """
 
+    def holevo_bound_vec(
+        self, V: np.ndarray, W: np.ndarray, Z: np.ndarray
+    ) -> np.ndarray:
+        """Compute the Holevo's bound elementwise on arrays of V, W and Z.
+
+        By default, holevo_bound is called on each element. Detectors can override
+        this method with a vectorised computation.
+
+        Args:
+            V (np.ndarray): coefficients of the first diagonal block of the covariance matrices.
+            W (np.ndarray): coefficients of the second diagonal block of the covariance matrices.
+            Z (np.ndarray): coefficients of the antidiagonal blocks of the covariance matrices.
+
+        Returns:
+            np.ndarray: Holevo's bounds.
+        """
+        return np.vectorize(self.holevo_bound, otypes=[float])(V, W, Z)
+
 
 class IdealHeterodyneDetector(Detector):
     """
@@ -91,14 +188,7 @@ class IdealHeterodyneDetector(Detector):
         Returns:
             Tuple[float, float, float]: tuple containing v1, v2, v3. v1, v2: symplectic eigenvalues of the two-modes covariance matrix. v3: symplectic eigenvalue of Alice's state, condinitioned by Bob's measurement.
         """
-        delt = delta(V, W, Z)
-        gam = gamma(V, W, Z)
-
-        v1 = sqrt((delt + sqrt(delt**2 - 4 * gam)) / 2)
-        v2 = sqrt((delt - sqrt(delt**2 - 4 * gam)) / 2)
-        v3 = V - Z**2 / (W + 1)
-
-        return v1, v2, v3
+        return _sympl_ideal(V, W, Z)
 
     def holevo_bound(self, V: float, W: float, Z: float) -> float:
         """
@@ -117,6 +207,28 @@ class IdealHeterodyneDetector(Detector):
 
         return g((v1 - 1) / 2) + g((v2 - 1) / 2) - g((v3 - 1) / 2)
 
+    def holevo_bound_vec(
+        self, V: np.ndarray, W: np.ndarray, Z: np.ndarray
+    ) -> np.ndarray:
+        """
+        Computes the Holevo bound elementwise on arrays of V, W and Z.
+
+        Args:
+            V (np.ndarray): coefficients of the first diagonal block of the covariance matrices
+            W (np.ndarray): coefficients of the second diagonal block of the covariance matrices
+            Z (np.ndarray): coefficients of the antidiagonal blocks of the covariance matrices
+
+        Returns:
+            np.ndarray: Holevo bounds of the mutual information between Eve and Bob.
+        """
+        v1, v2, v3 = _sympl_ideal(
+            np.asarray(V, dtype=float),
+            np.asarray(W, dtype=float),
+            np.asarray(Z, dtype=float),
+        )
+
+        return g_vec((v1 - 1) / 2) + g_vec((v2 - 1) / 2) - g_vec((v3 - 1) / 2)
+
 
 class NoisyHeterodyneDetector(Detector):
     """
@@ -151,35 +263,7 @@ class NoisyHeterodyneDetector(Detector):
         Returns:
             Tuple[float, float, float, float]: v1, v2, v3, v4. v1, v2: symplectic eigenvalues of the two-modes covariance matrix AB. v3, v4: two first symplectic eigenvalues of the two-modes covariance matrix AFG|b
         """
-        eta = self.eta
-        vel = self.vel
-
-        delt = delta(V, W, Z)
-        gam = gamma(V, W, Z)
-
-        v1 = sqrt((delt + sqrt(delt**2 - 4 * gam)) / 2)
-        v2 = sqrt((delt - sqrt(delt**2 - 4 * gam)) / 2)
-
-        nu = 1 + 2 * vel / (1 - eta)
-        nu = 1
-
-        r1 = (
-            (V * (1 + eta * W + nu - eta * nu) - eta * Z**2) ** 2
-            + (eta * nu + W * (1 - eta + nu)) ** 2
-            + (1 + nu + eta * (W * nu - 1)) ** 2
-            - 2 * (1 - eta) * (nu + 1) ** 2 * Z**2
-            - 2 * eta * (1 - eta) * (nu**2 - 1) * Z**2
-            - 2 * eta * (nu**2 - 1) * (1 + W) ** 2
-        ) / ((1 + W * eta + nu - eta * nu) ** 2)
-
-        r1 -= 1
-        r2 = (Z**2 - V * (W + eta) + (V * W - Z**2) * (-1 + eta) * nu) ** 2 / (
-            1 + W * eta + nu - eta * nu
-        ) ** 2
-
-        v3 = sqrt(0.5 * (r1 + sqrt(r1**2 - 4 * r2)))
-        v4 = sqrt(0.5 * (r1 - sqrt(r1**2 - 4 * r2)))
-        return v1, v2, v3, v4
+        return _sympl_noisy(V, W, Z, self.eta)
 
     def holevo_bound(self, V: float, W: float, Z: float) -> float:
         """
@@ -200,3 +284,31 @@ class NoisyHeterodyneDetector(Detector):
         v1, v2, v3, v4 = self.sympl(V, W, Z)
 
         return g((v1 - 1) / 2) + g((v2 - 1) / 2) - g((v3 - 1) / 2) - g((v4 - 1) / 2)
+
+    def holevo_bound_vec(
+        self, V: np.ndarray, W: np.ndarray, Z: np.ndarray
+    ) -> np.ndarray:
+        """
+        Computes the Holevo bound elementwise on arrays of V, W and Z.
+
+        Args:
+            V (np.ndarray): coefficients of the first diagonal block of the covariance matrices
+            W (np.ndarray): coefficients of the second diagonal block of the covariance matrices
+            Z (np.ndarray): coefficients of the antidiagonal blocks of the covariance matrices
+
+        Returns:
+            np.ndarray: Holevo bounds of the mutual information between Eve and Bob.
+        """
+        v1, v2, v3, v4 = _sympl_noisy(
+            np.asarray(V, dtype=float),
+            np.asarray(W, dtype=float),
+            np.asarray(Z, dtype=float),
+            self.eta,
+        )
+
+        return (
+            g_vec((v1 - 1) / 2)
+            + g_vec((v2 - 1) / 2)
+            - g_vec((v3 - 1) / 2)
+            - g_vec((v4 - 1) / 2)
+        )
@@ -20,8 +20,8 @@ Example script for qosst-sim.
 """
 
 import time
-from typing import List
 
+import numpy as np
 import matplotlib.pyplot as plt
 
 from qosst_sim.modulation.gaussian_qam import GaussianQAM
@@ -33,7 +33,7 @@ from qosst_sim.simulator.gaussian_channel_asymptotic_calculator import (
 )
 
 
-def linear_range(start: float, stop: float, num_points: int) -> List[float]:
+def linear_range(start: float, stop: float, num_points: int) -> np.ndarray:
     """
     Return a linear range from start to stop with num_points.
 
@@ -43,10 +43,9 @@ def linear_range(start: float, stop: float, num_points: int) -> List[float]:
         num_points (int): number of points in the range
 
     Returns:
-        List[float]: range.
+        np.ndarray: range.
     """
-    step = (stop - start) / num_points
-    return [start + x * step for x in range(num_points + 1)]
+    return np.linspace(start, stop, num_points + 1)
 
 
 def transmission(distance: float) -> float:
@@ -99,6 +98,9 @@ def main():
         " (noisy detector eta =" + str(eta) + " Vel = " + str(electronic_noise) + ")"
     )
 
+    # the output of the channel is sampled in the same buffer for all the distances
+    buffer = np.empty(num_symbols, dtype=np.complex64)
+
     for distance in varying_range:
         # initialize the channel of the desired type
         transmittance = transmission(distance)
@@ -108,7 +110,7 @@ def main():
 
         # initialize the simulator of the desired type
         simulator = FiniteSizeSimulator(
-            modulation, channel, detector, num_symbols, beta
+            modulation, channel, detector, num_symbols, beta, buffer=buffer
         )
         calculator = GaussianChannelAsymptoticCalculator(
             modulation, channel, detector, beta
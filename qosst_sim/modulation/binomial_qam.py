@@ -19,7 +19,6 @@
 Binomial QAM modulation.
 """
 from math import sqrt, comb
-from itertools import product
 
 import numpy as np
 
@@ -42,17 +41,14 @@ class BinomialQAM(QAM):
         self.size = size
 
         # the constellation and the distribution of the modulation
-        quadratures = range(-size + 1, size, 2)
-        constellation = np.array(
-            [x + 1j * y for x, y in product(quadratures, quadratures)]
-        )
+        quadratures = np.arange(-size + 1, size, 2)
+        real_parts, imag_parts = np.meshgrid(quadratures, quadratures, indexing="ij")
+        constellation = (real_parts + 1j * imag_parts).ravel()
 
         # probability distribution
-        self.distribution = np.array(
-            [
-                2 ** (-2 * (size - 1)) * comb(size - 1, k) * comb(size - 1, l)
-                for k, l in product(range(size), range(size))
-            ]
+        binomial = np.array([comb(size - 1, k) for k in range(size)], dtype=float)
+        self.distribution = np.outer(binomial, binomial).ravel() * 2.0 ** (
+            -2 * (size - 1)
         )
         # renormalised constellation
         self.constellation = constellation * sqrt(va / (4 * (size - 1)))
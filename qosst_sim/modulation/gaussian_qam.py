@@ -18,8 +18,6 @@
 """
 Gaussian QAM modulation.
 """
-from itertools import product
-
 import numpy as np
 
 from qosst_sim.modulation.qam import QAM
@@ -46,17 +44,17 @@ class GaussianQAM(QAM):
         self.nu = nu
 
         # the constellation and the distribution of the modulation
-        quadratures = range(-size + 1, size, 2)
-        constellation = np.array(
-            [x + 1j * y for x, y in product(quadratures, quadratures)]
-        )
-        total_weight = sum(np.exp(-nu * abs(constellation) ** 2))
+        quadratures = np.arange(-size + 1, size, 2)
+        real_parts, imag_parts = np.meshgrid(quadratures, quadratures, indexing="ij")
+        constellation = (real_parts + 1j * imag_parts).ravel()
+        abs2 = (real_parts * real_parts + imag_parts * imag_parts).ravel()
+        weights = np.exp(-nu * abs2)
 
         # probability distribution
-        self.distribution = np.exp(-nu * abs(constellation) ** 2) / total_weight
+        self.distribution = weights / weights.sum()
         # renormalised constellation
         self.constellation = constellation * np.sqrt(
-            va / (2 * np.dot(np.abs(constellation) ** 2, self.distribution))
+            va / (2 * np.dot(abs2, self.distribution))
         )
         # initialisation of all the matrices and and parameters depending of the distribution
         super().__init__(dim, va)
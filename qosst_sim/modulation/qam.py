@@ -18,32 +18,43 @@
 """
 QAM modulation.
 """
-from math import sqrt, exp, factorial
+import sys
+from functools import cached_property
 
 import numpy as np
 import scipy.linalg as alg
 
-from qosst_sim.utils import kron
 from qosst_sim.modulation.modulation import Modulation
 
 
-# pylint: disable=too-few-public-methods
+# pylint: disable=too-few-public-methods, too-many-instance-attributes
 class QAM(Modulation):
     """
     Quadrature and Amplitude Modulation (QAM).
+
+    The matrices tau_half, a_tau and the number w are computed once at
+    initialisation, and the other quantities only depending on the modulation are
+    cached on first access. A QAM instance should therefore be built once and shared
+    between all the simulators of a sweep.
     """
 
     dim: int  #: Dimension of the Fock space.
     distribution: np.ndarray  #: Distribution of probability over the constellation.
     constellation: np.ndarray  #: Sqaare constellation of qam points.
+    constellation_flat: np.ndarray  #: Constellation as a 1D contiguous complex128 array.
+    distribution_flat: np.ndarray  #: Distribution as a 1D contiguous float64 array.
+    const_x: np.ndarray  #: Real parts of the constellation points.
+    const_y: np.ndarray  #: Imaginary parts of the constellation points.
     tau_half: (
         np.ndarray
     )  #: Matrix defined in Denys, A., Brown, P., & Leverrier, A. (2021).
     a_tau: (
         np.ndarray
     )  #: Matrix defined in Denys, A., Brown, P., & Leverrier, A. (2021).
+    a_tau_expectations: np.ndarray  #: <alpha| a_tau |alpha> for each point alpha.
     size: int
 
+    # pylint: disable=too-many-locals
     def __init__(self, dim: int, va: float):
         """
         Child class from modulation, defining the subset of QAM modulation, which
@@ -64,23 +75,56 @@ class QAM(Modulation):
         super().__init__(va)
         self.dim = dim
 
+        # the constellation and the distribution as 1D contiguous arrays, on which the
+        # symbols are gathered with a single fancy indexing
+        self.constellation_flat = np.ascontiguousarray(
+            np.ravel(self.constellation), dtype=np.complex128
+        )
+        self.distribution_flat = np.ascontiguousarray(
+            np.ravel(self.distribution), dtype=np.float64
+        )
+
+        # real and imaginary parts of the constellation stored separately, from which
+        # the quadratures of Alice's symbols are gathered
+        self.const_x = np.ascontiguousarray(self.constellation_flat.real)
+        self.const_y = np.ascontiguousarray(self.constellation_flat.imag)
+
+        # log(n!) for n = 0, ..., dim - 1
+        self._logfact = np.concatenate(([0.0], np.cumsum(np.log(np.arange(1, dim)))))
+
         # matrix of the anihilation operator of the Fock space in the truncated basis
-        self.a = np.zeros((dim, dim), dtype=complex)
+        # i.e. sqrt(j) on the first superdiagonal
+        self.a = np.diag(np.sqrt(np.arange(1, dim)), k=1).astype(complex)
 
-        tau = np.zeros((dim, dim), dtype=complex)
+        # all the coherent states of the constellation, as the columns of a matrix
+        coherent_states = self.coherent_states.T
 
-        for i in range(dim):
-            for j in range(dim):
-                self.a[i, j] = sqrt(j) * kron(j - 1, i)
-                tau[i, j] = sum(
-                    weight * exp(-abs(alpha) ** 2) * alpha**i * alpha.conjugate() ** j
-                    for weight, alpha in zip(self.distribution, self.constellation)
-                ) / (sqrt(factorial(i)) * sqrt(factorial(j)))
+        # matrix of the modulation tau in the truncated Fock basis
+        # tau = sum_k p_k |alpha_k><alpha_k|, computed as a single matrix product
+        tau = (coherent_states * self.distribution_flat) @ coherent_states.conj().T
 
         # matrix square root of the modulation matrix tau in the truncated Fock basis
-        self.tau_half = alg.sqrtm(tau)
+        # tau is hermitian positive semidefinite, so it is obtained from its
+        # eigendecomposition (negative eigenvalues are numerical noise)
+        eigenvalues, eigenvectors = alg.eigh(tau)
+        sqrt_eigenvalues = np.sqrt(np.clip(eigenvalues, 0, None))
+        eigenvectors_dag = eigenvectors.conj().T
+        self.tau_half = (eigenvectors * sqrt_eigenvalues) @ eigenvectors_dag
+
         # matrix of a_tau in the truncated Fock basis
-        self.a_tau = self.tau_half @ self.a @ alg.pinvh(self.tau_half)
+        # a_tau = tau_half @ a @ inv(tau_half), where the pseudoinverse of tau_half is
+        # taken from its eigendecomposition, since tau can be rank deficient at high
+        # truncation
+        cutoff = dim * sys.float_info.epsilon * sqrt_eigenvalues.max()
+        nonzero = sqrt_eigenvalues > cutoff
+        inv_sqrt_eigenvalues = np.zeros_like(sqrt_eigenvalues)
+        inv_sqrt_eigenvalues[nonzero] = 1 / sqrt_eigenvalues[nonzero]
+        self.a_tau = (
+            self.tau_half
+            @ self.a
+            @ (eigenvectors * inv_sqrt_eigenvalues)
+            @ eigenvectors_dag
+        )
 
         # w : number (defined in Denys, A., Brown, P., & Leverrier, A. (2021). Explicit
         # asymptotic secret key rate of continuous-variable quantum key distribution
@@ -88,19 +132,63 @@ class QAM(Modulation):
         # weight from a random input coherent state of the modulation tau is mapped by
         # a_tau, onto a subspace orthogonal from the input coherent state.
 
-        w = 0
-        a_tau_dag = self.a_tau.T.conjugate()
+        a_tau_coherent_states = self.a_tau @ coherent_states
 
-        for weight, alpha in zip(self.distribution, self.constellation):
-            coherent_state = self.coherent_state(alpha)
-            coherent_state_dag = coherent_state.T.conjugate()
+        # <alpha| a_tau^dag a_tau |alpha> and <alpha| a_tau |alpha> for each alpha
+        norms = np.einsum(
+            "ik,ik->k", a_tau_coherent_states.conj(), a_tau_coherent_states
+        ).real
+        self.a_tau_expectations = np.einsum(
+            "ik,ik->k", coherent_states.conj(), a_tau_coherent_states
+        )
 
-            w += weight * (
-                coherent_state_dag @ a_tau_dag @ self.a_tau @ coherent_state
-                - abs(coherent_state_dag @ self.a_tau @ coherent_state) ** 2
-            )
+        self.w = float(
+            np.dot(self.distribution_flat, norms - np.abs(self.a_tau_expectations) ** 2)
+        )
+
+    @cached_property
+    def coherent_states(self) -> np.ndarray:
+        """
+        Coherent states of all the points of the constellation, built at once.
 
-        self.w = w.real
+        Returns:
+            np.ndarray: array of shape (size**2, dim) whose k-th row is the coherent state of the k-th point of the constellation in the truncated Fock basis.
+        """
+        return self._coherent_states(self.constellation_flat)
+
+    @cached_property
+    def cdf(self) -> np.ndarray:
+        """
+        Cumulative distribution function over the constellation, used to sample the
+        points of the constellation by inversion.
+
+        Returns:
+            np.ndarray: cumulative sums of the distribution, normalised so that the last one is exactly 1.
+        """
+        cdf = np.cumsum(self.distribution_flat)
+        return cdf / cdf[-1]
+
+    @cached_property
+    def tau_half_a_trace(self) -> float:
+        """
+        Real part of trace(tau_half @ a @ tau_half @ a^dag), used to compute c1 in
+        the asymptotic limit with a Gaussian channel.
+
+        Returns:
+            float: real part of the trace.
+        """
+        # a only has sqrt(n + 1) at (n, n + 1), so the trace reduces to
+        # sum_{m, n} sqrt(m + 1) sqrt(n + 1) tau_half[m, n] tau_half[n + 1, m + 1]
+        sqrt_n = np.sqrt(np.arange(1, self.dim))
+        return float(
+            np.einsum(
+                "mn,nm,m,n->",
+                self.tau_half[:-1, :-1],
+                self.tau_half[1:, 1:],
+                sqrt_n,
+                sqrt_n,
+            ).real
+        )
 
     def coherent_state(self, alpha: complex) -> np.ndarray:
         """
@@ -110,6 +198,31 @@ class QAM(Modulation):
         Returns:
             np.ndarray: vector of the alpha coherent state in the truncated Fock basis of size dim.
         """
-        return exp(-abs(alpha) ** 2 / 2) * np.array(
-            [alpha**n / sqrt(factorial(n)) for n in range(self.dim)]
-        )
+        return self._coherent_states(np.array([alpha]))[0]
+
+    def _coherent_states(self, alphas: np.ndarray) -> np.ndarray:
+        """
+        Coherent states of several complex numbers, as the rows of a matrix.
+
+        The coefficients exp(-|alpha|^2/2) alpha^n / sqrt(n!) are computed in log space,
+        since alpha^n and sqrt(n!) can both get close to overflow before being
+        compensated.
+
+        Args:
+            alphas (np.ndarray): 1D array of eigenvalues of the coherent states for the anihilation operator a.
+
+        Returns:
+            np.ndarray: array of shape (len(alphas), dim) whose rows are the coherent states in the truncated Fock basis.
+        """
+        alphas = np.asarray(alphas, dtype=complex)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            states = np.exp(
+                np.arange(self.dim)[None, :] * np.log(alphas)[:, None]
+                - 0.5 * self._logfact[None, :]
+                - 0.5 * np.abs(alphas)[:, None] ** 2
+            )
+
+        # log(0) is undefined: the coherent state of 0 is the vacuum
+        states[alphas == 0] = 0
+        states[alphas == 0, 0] = 1
+        return states
@@ -0,0 +1,131 @@
+# qosst-sim - Simulation module of the Quantum Open Software for Secure Transmissions.
+# Copyright (C) 2021-2024 Mayeul Chavanne
+# Copyright (C) 2021-2024 Yoann Piétri
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Abstract class for the asymptotic calculators with a Gaussian channel.
+"""
+import abc
+from typing import Tuple
+
+import numpy as np
+
+from qosst_sim.simulator.simulator import Simulator
+from qosst_sim.modulation.modulation import Modulation
+from qosst_sim.channel import GaussianChannel
+from qosst_sim.detector import Detector
+
+
+class AsymptoticCalculator(Simulator):
+    """
+    Abstract class meant to be sub-classed, for the asymptotic calculators with a
+    Gaussian channel, where n_B, c1, c2 and the Shot Noise Ratio are given by formulas
+    of the transmittance and of the excess noise of the channel. These formulas can
+    also be evaluated on arrays, so the secret key rate can be swept over the
+    parameters of the channel at once.
+    """
+
+    def __init__(
+        self,
+        modulation: Modulation,
+        channel: GaussianChannel,
+        detector: Detector,
+        beta: float = 0.95,
+    ):
+        """
+        Args:
+            modulation (Modulation): class modulation object modulation chosen by Alice to sample the state that she wil send to Bob.
+            channel (GaussianChannel): class GaussianChannel object channel used, which must be gaussian.
+            detector (Detector): class Detector object detecor used by Bob, which can be ideal or noisy.
+            beta (float): reconciliation efficiency; a parameter that quantifies how much extra information Bob needs to send to Alice through the authenticated classical channel for her to correctly infer the value of Y, typically equal to 0.95 in practice.
+        """
+        super().__init__(modulation, channel, detector, beta)
+
+        self.n_B, self.c1, self.c2 = self._parameters(self.channel.t, self.channel.xi)
+
+    @abc.abstractmethod
+    def _parameters(
+        self, transmittance: float, excess_noise: float
+    ) -> Tuple[float, float, float]:
+        """
+        Theorical values of n_B, c1 and c2. The transmittance and the excess noise can
+        also be arrays, in which case the values are computed elementwise.
+
+        Args:
+            transmittance (float): transmittance of the channel.
+            excess_noise (float): excess noise of the channel.
+
+        Returns:
+            Tuple[float, float, float]: n_B, c1, c2.
+        """
+
+    def _snr(self, transmittance: float, excess_noise: float) -> float:
+        """
+        Theorical Shot Noise Ratio, which depends on detection. The transmittance and
+        the excess noise can also be arrays, in which case the values are computed
+        elementwise.
+
+        Args:
+            transmittance (float): transmittance of the channel.
+            excess_noise (float): excess noise of the channel.
+
+        Returns:
+            float: Shot Noise Ratio of the protocol.
+        """
+        eta = self.detector.eta
+        return (
+            transmittance
+            * self.modulation.va
+            * eta
+            / (2 + 2 * self.detector.vel + eta * transmittance * excess_noise)
+        )
+
+    def snr(self) -> float:
+        """
+        Returns:
+            float: Shot Noise Ratio of the protocol, which is computed with the theoretical formula above, and which depends on detection.
+        """
+        return self._snr(self.channel.t, self.channel.xi)
+
+    def skr_sweep(
+        self, transmittances: np.ndarray, excess_noises: np.ndarray
+    ) -> np.ndarray:
+        """
+        Estimate of the Secret Key Rate for arrays of transmittances and excess noises
+        of the channel, the modulation and the detector being the ones of the
+        calculator. The covariance matrices and the Holevo bounds are computed
+        elementwise on the whole sweep at once.
+
+        Args:
+            transmittances (np.ndarray): transmittances of the channel.
+            excess_noises (np.ndarray): excess noises of the channel, broadcastable with the transmittances.
+
+        Returns:
+            np.ndarray: estimates of the secret key rate, with the broadcast shape of the transmittances and the excess noises.
+        """
+        transmittances, excess_noises = np.broadcast_arrays(
+            np.asarray(transmittances, dtype=float),
+            np.asarray(excess_noises, dtype=float),
+        )
+        v, w, z_star = self._covariance(
+            *self._parameters(transmittances, excess_noises)
+        )
+
+        holevo_bounds = self.detector.holevo_bound_vec(v, w, z_star)
+        return (
+            self.beta * np.log2(1 + self._snr(transmittances, excess_noises))
+            - holevo_bounds
+        )
@@ -18,10 +18,10 @@
 """
 Simulations with finite size effect.
 """
-from collections import Counter
+from math import sqrt
+from typing import Dict, Optional, Tuple
 
 import numpy as np
-from scipy import stats
 
 from qosst_sim.simulator.simulator import Simulator
 from qosst_sim.modulation.qam import QAM
@@ -29,6 +29,169 @@ from qosst_sim.channel import GaussianChannel
 from qosst_sim.detector import Detector
 
 
+def _dot(first: np.ndarray, second: np.ndarray) -> float:
+    """
+    Dot product of two real arrays, accumulated in double precision.
+
+    Args:
+        first (np.ndarray): first array.
+        second (np.ndarray): second array.
+
+    Returns:
+        float: dot product of the two arrays.
+    """
+    return float(np.einsum("i,i->", first, second, dtype=np.float64))
+
+
+def _snr(
+    alice_q: np.ndarray, alice_p: np.ndarray, bob_q: np.ndarray, bob_p: np.ndarray
+) -> float:
+    """
+    Empirical estimator of the Shot Noise Ratio from Alice's and Bob's quadratures.
+
+    Args:
+        alice_q (np.ndarray): real parts of Alice's symbols.
+        alice_p (np.ndarray): imaginary parts of Alice's symbols.
+        bob_q (np.ndarray): real parts of Bob's symbols.
+        bob_p (np.ndarray): imaginary parts of Bob's symbols.
+
+    Returns:
+        float: estimated Shot Noise Ratio.
+    """
+    # sum(qk_alice * qk_bob + pk_alice * pk_bob), sum(|alice|^2) and sum(|bob|^2),
+    # as dot products on the contiguous real and imaginary parts, accumulated in
+    # double precision
+    alice_bob = _dot(alice_q, bob_q) + _dot(alice_p, bob_p)
+    alice2 = _dot(alice_q, alice_q) + _dot(alice_p, alice_p)
+    bob2 = _dot(bob_q, bob_q) + _dot(bob_p, bob_p)
+
+    rho_hat = alice_bob / alice2
+    return 1 / (bob2 / (rho_hat**2 * alice2) - 1)
+
+
+# pylint: disable=invalid-name, too-many-arguments
+def _estimate_parameters(
+    bob_q: np.ndarray,
+    bob_p: np.ndarray,
+    counts: np.ndarray,
+    distribution: np.ndarray,
+    constellation: np.ndarray,
+    a_tau_expectations: np.ndarray,
+) -> Tuple[np.ndarray, float, float, float]:
+    """
+    Estimate betas, nB, c1 and c2 from Bob's quadratures with segmented reductions.
+
+    Bob's quadratures must be sorted by the point of the constellation sent by Alice, so
+    that the symbols sent for the k-th point form a contiguous segment of size
+    counts[k].
+
+    Args:
+        bob_q (np.ndarray): real parts of Bob's symbols, sorted by the point sent by Alice.
+        bob_p (np.ndarray): imaginary parts of Bob's symbols, sorted by the point sent by Alice.
+        counts (np.ndarray): number of symbols sent for each point of the constellation.
+        distribution (np.ndarray): distribution of probability over the constellation.
+        constellation (np.ndarray): points of the constellation.
+        a_tau_expectations (np.ndarray): <alpha| a_tau |alpha> for each point of the constellation.
+
+    Returns:
+        Tuple[np.ndarray, float, float, float]: betas, the weighted mean of |y|^2 (nB before removing the noise of the detector), c1 and c2.
+    """
+    offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    present = counts > 0
+
+    betas = np.zeros(len(counts), dtype=np.complex64)
+    betas[present] = (
+        np.add.reduceat(bob_q, offsets[present], dtype=np.float64)
+        + 1j * np.add.reduceat(bob_p, offsets[present], dtype=np.float64)
+    ) / counts[present]
+
+    # |y|^2 without a square root, accumulated in a single temporary array
+    abs2 = bob_q * bob_q
+    abs2 += bob_p * bob_p
+    abs2_sums = np.add.reduceat(abs2, offsets[present], dtype=np.float64)
+    n_B = np.sum(distribution[present] * abs2_sums / counts[present])
+
+    c1 = np.sum(distribution * a_tau_expectations.conj() * betas).real
+    c2 = np.sum(distribution * np.conj(constellation) * betas).real
+
+    return betas, n_B, c1, c2
+
+
+# pylint: disable=too-many-arguments, too-many-locals
+def _sample_strings(
+    modulation: QAM,
+    channel: GaussianChannel,
+    detector: Detector,
+    n_symbols: int,
+    n_trials: int,
+    rng: np.random.Generator,
+    buffer: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Sample Alice's and Bob's strings of n_trials independent simulations of n_symbols
+    symbols each.
+
+    The symbols of each trial are sorted by the point of the constellation sent by
+    Alice, and the trials are concatenated one after the other.
+
+    Args:
+        modulation (QAM): class QAM object modulation chosen by Alice, which must be discrete (QAM).
+        channel (GaussianChannel): class Channel object channel used.
+        detector (Detector) : class Detector object detecor used by Bob, which can be ideal or noisy.
+        n_symbols (int): number of symbols exchanged in each trial.
+        n_trials (int): number of trials.
+        rng (np.random.Generator): random generator used to sample Alice's symbols and the output of the channel.
+        buffer (Optional[np.ndarray]): complex64 array of size n_trials * n_symbols in which the output of the channel is sampled. If None, a new array is allocated. Defaults to None.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]: counts of each point of the constellation for each trial, of shape (n_trials, size**2), and the real and imaginary parts of Alice's and Bob's symbols (alice_q, alice_p, bob_q, bob_p).
+    """
+    n_points = modulation.size**2
+
+    # first, sample Alice's data according to the distribution
+    # we must assume that we have already defined the constellation and the distribution
+    # the indices are sampled by inversion of the cumulative distribution
+    rvs = np.searchsorted(
+        modulation.cdf, rng.random((n_trials, n_symbols)), side="right"
+    )
+
+    # very important step: we sort the array, so that we can compute c1, c2 and n_B easily
+    # the samples are indices of the constellation, so they are sorted by counting. The
+    # indices are offset by n_points for each trial, so a single bincount gives the
+    # counts of all the trials
+    counts = np.bincount(
+        (rvs + n_points * np.arange(n_trials)[:, None]).ravel(),
+        minlength=n_points * n_trials,
+    ).reshape(n_trials, n_points)
+    raw_data = np.repeat(np.tile(np.arange(n_points), n_trials), counts.ravel())
+
+    # this random sample is then mapped to a random choice of symbols...
+    # the strings are stored as separate real and imaginary parts, which is the
+    # layout all the reductions work on, in single precision to halve the
+    # memory traffic (the reductions accumulate in double precision)
+    alice_q = modulation.const_x.astype(np.float32)[raw_data]
+    alice_p = modulation.const_y.astype(np.float32)[raw_data]
+
+    # then, we sample Bob's data accodring to the law of the chosen channel
+    measured_quadratures = channel.sample_output(
+        modulation.constellation_flat.astype(np.complex64)[raw_data],
+        detector,
+        rng=rng,
+        out=buffer,
+        dtype=np.complex64,
+    )
+
+    # Bob's string
+    # the scale is applied while copying the quadratures to their contiguous arrays,
+    # and is a Python float so that the result stays in single precision
+    scale = sqrt(2 / detector.eta)  # ???
+    bob_q = np.multiply(measured_quadratures.real, scale)
+    bob_p = np.multiply(measured_quadratures.imag, scale)
+
+    return counts, alice_q, alice_p, bob_q, bob_p
+
+
+# pylint: disable=too-many-instance-attributes
 class FiniteSizeSimulator(Simulator):
     """
     Class inheriting from simulator, describing the case where the numbner
@@ -42,8 +205,10 @@ class FiniteSizeSimulator(Simulator):
     exchange an infinite number of symbols.
     """
 
-    alice_string: np.ndarray
-    bob_string: np.ndarray
+    alice_q: np.ndarray  #: Real parts of Alice's symbols.
+    alice_p: np.ndarray  #: Imaginary parts of Alice's symbols.
+    bob_q: np.ndarray  #: Real parts of Bob's symbols.
+    bob_p: np.ndarray  #: Imaginary parts of Bob's symbols.
     betas: np.ndarray
     n_symbols: int
     modulation: QAM
@@ -56,6 +221,8 @@ class FiniteSizeSimulator(Simulator):
         detector: Detector,
         n_symbols: int,
         beta: float = 0.95,
+        buffer: Optional[np.ndarray] = None,
+        rng: Optional[np.random.Generator] = None,
     ):
         """
         Args:
@@ -64,93 +231,125 @@ class FiniteSizeSimulator(Simulator):
             detector (Detector) : class Detector object detecor used by Bob, which can be ideal or noisy.
             n_symbols (int): number of symbols exchanged.
             beta (float):  reconciliation efficiency; a parameter that quantifies how much extra information Bob needs to send to Alice through the authenticated classical channel for her to correctly infer the value of Y, typically equal to 0.95 in practice.
+            buffer (Optional[np.ndarray]): complex64 array of size n_symbols in which the output of the channel is sampled, that can be reused from one simulation to the other. If None, a new array is allocated. Defaults to None.
+            rng (Optional[np.random.Generator]): random generator used to sample Alice's symbols and the output of the channel. If None, the generator of the channel is used. Defaults to None.
         """
         super().__init__(modulation, channel, detector, beta)
         self.n_symbols = n_symbols
 
-        # first, sample Alice's data according to the distribution
-        # we must assume that we have already defined the constellation and the distribution
-        custm = stats.rv_discrete(
-            name="custm",
-            values=(range(self.modulation.size**2), self.modulation.distribution),
-        )
-
-        # very important step: we sort the array, so that we can compute c1, c2 and n_B easily
-        rvs = custm.rvs(size=self.n_symbols)
-        raw_data = np.sort(rvs)
+        if rng is None:
+            rng = self.channel.rng
 
-        # this random sample is then mapped to a random choice of symbols...
-        self.alice_string = np.array(
-            [self.modulation.constellation[x] for x in raw_data]
+        counts, self.alice_q, self.alice_p, self.bob_q, self.bob_p = _sample_strings(
+            self.modulation,
+            self.channel,
+            self.detector,
+            self.n_symbols,
+            n_trials=1,
+            rng=rng,
+            buffer=buffer,
         )
 
-        # then, we sample Bob's data accodring to the law of the chosen channel
-        measured_quadratures = self.channel.sample_output(
-            self.alice_string, self.detector
+        # compute the estimated values of the symbols beta_k detected by Bob, of nB,
+        # c1 and c2
+        betas, n_B, c1, c2 = _estimate_parameters(
+            self.bob_q,
+            self.bob_p,
+            counts[0],
+            self.modulation.distribution_flat,
+            self.modulation.constellation_flat,
+            self.modulation.a_tau_expectations,
         )
 
-        # Bob's string
-        self.bob_string = np.sqrt(2 / self.detector.eta) * measured_quadratures  # ???
-
-        raw_datas = Counter(raw_data)
-
-        # compute the estimated values of the symbols beta_k detected by Bob, and of nB
-        betas = np.zeros(self.modulation.size**2, dtype=np.complex64)
-        n_B = 0.0  # test_1.2
-        #       n_B = -1 # test_1.1 et test_1.3
-
-        i = 0
-        for x in raw_datas:  # i.e for x in range(self.m ** 2)
-            freq = raw_datas[x]
-            betas[x] = np.mean(self.bob_string[i : i + freq])
-            n_B += self.modulation.distribution[x] * np.mean(
-                np.abs(self.bob_string[i : i + freq]) ** 2
-            )
-            i += freq
-
         #        nB -= (1 + self.detector.Vel) / self.detector.eta - 1 # test_1.1
         n_B -= (1 + self.detector.vel) / self.detector.eta  # test_1.2
 
         self.betas = betas
         self.n_B = n_B
+        self.c1 = c1
+        self.c2 = c2
 
-        c1 = 0
-        c2 = 0
-        a_tau = self.modulation.a_tau
+    @property
+    def alice_string(self) -> np.ndarray:
+        """
+        Alice's symbols, rebuilt as a complex array on each access.
 
-        for weight, alpha, betak in zip(
-            self.modulation.distribution, self.modulation.constellation, self.betas
-        ):
-            coherent_state = self.modulation.coherent_state(alpha)
-            coherent_state_dag = coherent_state.T.conjugate()
+        Returns:
+            np.ndarray: Alice's symbols.
+        """
+        return self.alice_q + 1j * self.alice_p
 
-            c1 += (
-                weight
-                * (coherent_state_dag @ a_tau @ coherent_state).conjugate()
-                * betak
-            )
-            c2 += weight * alpha.conjugate() * betak
+    @property
+    def bob_string(self) -> np.ndarray:
+        """
+        Bob's symbols, rebuilt as a complex array on each access.
 
-        self.c1 = c1.real
-        self.c2 = c2.real
+        Returns:
+            np.ndarray: Bob's symbols.
+        """
+        return self.bob_q + 1j * self.bob_p
 
     def snr(self) -> float:
         """
         Returns:
             float: Shot Noise Ratio of the protocol, which is computed with the empirical estimator.
         """
-        alice = self.alice_string
-        bob = self.bob_string
-
-        rho_hat = (
-            np.dot(alice.real, bob.real) + np.dot(alice.imag, bob.imag)
-        ) / np.sum(abs(alice) ** 2)
-        qk_alice = alice.real
-        pk_alice = alice.imag
-
-        qk_bob = bob.real
-        pk_bob = bob.imag
-        return 1 / (
-            sum(qk_bob**2 + pk_bob**2) / sum(rho_hat**2 * (qk_alice**2 + pk_alice**2))
-            - 1
+        return _snr(self.alice_q, self.alice_p, self.bob_q, self.bob_p)
+
+    # pylint: disable=too-many-arguments, too-many-locals
+    @classmethod
+    def run_batch(
+        cls,
+        modulation: QAM,
+        channel: GaussianChannel,
+        detector: Detector,
+        n_symbols: int,
+        n_trials: int,
+        rng: Optional[np.random.Generator] = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Run n_trials independent finite size simulations at once, for Monte-Carlo
+        statistics on the estimated parameters.
+
+        The strings of all the trials are sampled at once, and only the segmented
+        reductions are done trial by trial.
+
+        Args:
+            modulation (QAM): class QAM object modulation chosen by Alice, which must be discrete (QAM).
+            channel (GaussianChannel): class Channel object channel used.
+            detector (Detector) : class Detector object detecor used by Bob, which can be ideal or noisy.
+            n_symbols (int): number of symbols exchanged in each trial.
+            n_trials (int): number of trials.
+            rng (Optional[np.random.Generator]): random generator used to sample Alice's symbols and the output of the channel. If None, the generator of the channel is used. Defaults to None.
+
+        Returns:
+            Dict[str, np.ndarray]: arrays of size n_trials of the estimated c1, c2, n_B and snr, with keys "c1", "c2", "n_B" and "snr".
+        """
+        if rng is None:
+            rng = channel.rng
+        counts, alice_q, alice_p, bob_q, bob_p = _sample_strings(
+            modulation, channel, detector, n_symbols, n_trials, rng
         )
+
+        results = {key: np.empty(n_trials) for key in ("c1", "c2", "n_B", "snr")}
+        for trial in range(n_trials):
+            trial_slice = slice(trial * n_symbols, (trial + 1) * n_symbols)
+            _, n_B, c1, c2 = _estimate_parameters(
+                bob_q[trial_slice],
+                bob_p[trial_slice],
+                counts[trial],
+                modulation.distribution_flat,
+                modulation.constellation_flat,
+                modulation.a_tau_expectations,
+            )
+            results["c1"][trial] = c1
+            results["c2"][trial] = c2
+            results["n_B"][trial] = n_B - (1 + detector.vel) / detector.eta
+            results["snr"][trial] = _snr(
+                alice_q[trial_slice],
+                alice_p[trial_slice],
+                bob_q[trial_slice],
+                bob_p[trial_slice],
+            )
+
+        return results
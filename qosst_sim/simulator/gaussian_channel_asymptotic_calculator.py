@@ -19,15 +19,17 @@
 Simulator for the asymptotic case with a Guassian channel.
 """
 
-from math import sqrt
+from typing import Tuple
 
-from qosst_sim.simulator.simulator import Simulator
+import numpy as np
+
+from qosst_sim.simulator.asymptotic_calculator import AsymptoticCalculator
 from qosst_sim.modulation.qam import QAM
 from qosst_sim.channel import GaussianChannel
 from qosst_sim.detector import Detector
 
 
-class GaussianChannelAsymptoticCalculator(Simulator):
+class GaussianChannelAsymptoticCalculator(AsymptoticCalculator):
     """
     Class inheriting from simulator, describing the particular case where
     the channel is supposed to be gaussian. In this special case, one can have
@@ -56,25 +58,23 @@ class GaussianChannelAsymptoticCalculator(Simulator):
         """
         super().__init__(modulation, channel, detector, beta)
 
-        tau_half = self.modulation.tau_half
-        a = self.modulation.a
-        a_dag = a.T  # transpose
-        t = self.channel.t  # transmission
+    def _parameters(
+        self, transmittance: float, excess_noise: float
+    ) -> Tuple[float, float, float]:
+        """
+        Theorical values of n_B, c1 and c2 for a QAM modulation. The transmittance and
+        the excess noise can also be arrays, in which case the values are computed
+        elementwise.
 
-        self.n_B = t * (self.modulation.va + self.channel.xi) / 2
-        self.c1 = sqrt(t) * (tau_half @ a @ tau_half @ a_dag).trace().real
-        self.c2 = sqrt(t) * self.modulation.va / 2
+        Args:
+            transmittance (float): transmittance of the channel.
+            excess_noise (float): excess noise of the channel.
 
-    def snr(self) -> float:
-        """
         Returns:
-            float: Shot Noise Ratio of the protocol, which is computed with the theoretical formula above, and which depends on detection.
+            Tuple[float, float, float]: n_B, c1, c2.
         """
-        t = self.channel.t
-        eta = self.detector.eta
-        return (
-            t
-            * self.modulation.va
-            * eta
-            / (2 + 2 * self.detector.vel + eta * t * self.channel.xi)
-        )
+        n_B = transmittance * (self.modulation.va + excess_noise) / 2
+        # the trace only depends on the modulation and is cached there
+        c1 = np.sqrt(transmittance) * self.modulation.tau_half_a_trace
+        c2 = np.sqrt(transmittance) * self.modulation.va / 2
+        return n_B, c1, c2
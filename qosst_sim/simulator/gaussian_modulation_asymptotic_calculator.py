@@ -19,15 +19,17 @@
 Class for simulating the case of a Gaussian modulation and a Gaussian channel.
 """
 
-from math import sqrt
+from typing import Tuple
 
-from qosst_sim.simulator.simulator import Simulator
+import numpy as np
+
+from qosst_sim.simulator.asymptotic_calculator import AsymptoticCalculator
 from qosst_sim.modulation.modulation import GaussianModulation
 from qosst_sim.channel import GaussianChannel
 from qosst_sim.detector import Detector
 
 
-class GaussianModulationAsymptoticCalculator(Simulator):
+class GaussianModulationAsymptoticCalculator(AsymptoticCalculator):
     """
     Class inheriting from simulator, describing the particular case where
     the channel and the modulation are supposed to be gaussian. In this very
@@ -55,22 +57,23 @@ class GaussianModulationAsymptoticCalculator(Simulator):
         """
         super().__init__(modulation, channel, detector, beta)
 
-        t = self.channel.t
-        va = self.modulation.va
-        self.n_B = t * (va + self.channel.xi) / 2
-        self.c1 = sqrt(t * va / 2 * (va / 2 + 1))
-        self.c2 = sqrt(t) * va / 2
-
-    def snr(self) -> float:
+    def _parameters(
+        self, transmittance: float, excess_noise: float
+    ) -> Tuple[float, float, float]:
         """
+        Theorical values of n_B, c1 and c2 for a Gaussian modulation. The transmittance
+        and the excess noise can also be arrays, in which case the values are computed
+        elementwise.
+
+        Args:
+            transmittance (float): transmittance of the channel.
+            excess_noise (float): excess noise of the channel.
+
         Returns:
-            float: Shot Noise Ratio of the protocol, which is computed with the theoretical formula above, and which depends on detection.
+            Tuple[float, float, float]: n_B, c1, c2.
         """
-        t = self.channel.t
-        eta = self.detector.eta
-        return (
-            t
-            * self.modulation.va
-            * eta
-            / (2 + 2 * self.detector.vel + eta * t * self.channel.xi)
-        )
+        va = self.modulation.va
+        n_B = transmittance * (va + excess_noise) / 2
+        c1 = np.sqrt(transmittance * va / 2 * (va / 2 + 1))
+        c2 = np.sqrt(transmittance) * va / 2
+        return n_B, c1, c2
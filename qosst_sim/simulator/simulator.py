@@ -95,10 +95,27 @@ class Simulator(abc.ABC):
         Returns:
             Tuple[float, float, float]: V, W, Z_star. V:  exact value af V known by Alice. W: estimate of W based on the estimation of nB. Z_star: Denys-Brown-Leverrier's bound on Z
         """
+        return self._covariance(self.n_B, self.c1, self.c2)
+
+    def _covariance(
+        self, n_B: float, c1: float, c2: float
+    ) -> Tuple[float, float, float]:
+        """
+        V, W and Z_star of :meth:`covariance` for given values of n_B, c1 and c2, which
+        can also be arrays, in which case the bounds are computed elementwise.
+
+        Args:
+            n_B (float): quantity defined in Denys, A., Brown, P., & Leverrier, A. (2021).
+            c1 (float): quantity defined in Denys, A., Brown, P., & Leverrier, A. (2021).
+            c2 (float): quantity defined in Denys, A., Brown, P., & Leverrier, A. (2021).
+
+        Returns:
+            Tuple[float, float, float]: V, W, Z_star.
+        """
         v = self.modulation.va + 1
-        w = 2 * self.n_B + 1
-        racine = self.modulation.w * (self.n_B - 2 * self.c2**2 / (self.modulation.va))
-        z_star = (2 * self.c1 - 2 * np.sqrt(racine)).real
+        w = 2 * n_B + 1
+        racine = self.modulation.w * (n_B - 2 * c2**2 / (self.modulation.va))
+        z_star = (2 * c1 - 2 * np.sqrt(racine)).real
         return v, w, z_star
 
     def skr(self) -> float:
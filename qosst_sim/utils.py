@@ -20,6 +20,8 @@ Some utils for the qosst_sim module.
 """
 from math import log2
 
+import numpy as np
+
 # import matplotlib.pyplot as plt
 
 
@@ -42,7 +44,7 @@ def kron(i: int, j: int) -> int:
     Returns:
         int: 1 if i=j and 0 otherwise.
     """
-    return int(i == j)
+    return 1 if i == j else 0
 
 
 def g(x: float) -> float:
@@ -57,6 +59,23 @@ def g(x: float) -> float:
     return (x + 1) * log2(x + 1) - x * log2(x)
 
 
+def g_vec(x: np.ndarray) -> np.ndarray:
+    """Vectorized version of the g function, evaluated elementwise.
+
+    The value at x = 0 is taken as its limit, 0. Negative or NaN inputs, for which g
+    is not defined, give NaN.
+
+    Args:
+        x (np.ndarray): input array.
+
+    Returns:
+        np.ndarray: output of the g function for each element of x.
+    """
+    x = np.asarray(x, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(x == 0, 0.0, (x + 1) * np.log2(x + 1) - x * np.log2(x))
+
+
 def delta(v: float, w: float, z: float) -> float:
     """Coeficent needed to compute the sympleptic values of the 2-modes covariance matrix
 